@@ -116,19 +116,25 @@ def main(
             console.print(f"[red]Error updating index:[/red] {e}")
             raise typer.Exit(1) from e
 
-    # Fetch templates
-    templates_content = {}
+    # Fetch templates concurrently; the fetcher's session pools connections
+    fetched = {}
     failed_templates = []
 
-    for template_name in resolved_names:
+    for template_name, future in fetcher.get_templates(
+        resolved_names, no_cache=no_cache
+    ):
         try:
-            content = fetcher.get_template(template_name, no_cache=no_cache)
-            templates_content[template_name] = content
+            fetched[template_name] = future.result()
             console.print(f"[green]✓[/green] Fetched {template_name}")
         except Exception as e:
             console.print(f"[red]✗[/red] Failed to fetch {template_name}: {e}")
             failed_templates.append(template_name)
 
+    # Restore the order the templates were requested in
+    templates_content = {
+        name: fetched[name] for name in resolved_names if name in fetched
+    }
+
     if failed_templates:
         console.print(
             f"\n[yellow]Warning:[/yellow] Failed to fetch {len(failed_templates)} template(s)",
@@ -153,6 +159,7 @@ def main(
             existing_content=existing_content,
             append=append,
             include_header=True,
+            cache_dir=None if no_cache else get_cache_dir(),
         )
     except Exception as e:
         console.print(f"[red]Error combining templates:[/red] {e}")
@@ -188,11 +195,12 @@ def list_templates() -> None:
             return
 
         # Group templates by category
+        global_names = fetcher.global_template_names()
         global_templates = []
         regular_templates = []
 
         for template in sorted(templates):
-            if template.startswith("Global/"):
+            if template in global_names:
                 global_templates.append(template)
             else:
                 regular_templates.append(template)
@@ -237,6 +245,7 @@ def search(
         if not matches:
             console.print(f"[yellow]No templates found matching '{query}'[/yellow]")
             return
+        global_names = fetcher.global_template_names()
 
         # Create table
         table = Table(title=f"Templates matching '{query}'")
@@ -245,9 +254,7 @@ def search(
 
         for template in sorted(matches):
             category = (
-                "Global/Editor"
-                if template.startswith("Global/")
-                else "Language/Framework"
+                "Global/Editor" if template in global_names else "Language/Framework"
             )
             table.add_row(template, category)
 
@@ -279,10 +286,11 @@ def show(
 def doctor() -> None:
     """Show diagnostic information about gi's cache and configuration."""
     import json
+    import os
     import time
 
     from .fetch import get_fetcher
-    from .util import get_index_cache_path
+    from .util import get_index_cache_path, load_json
 
     console.print("[bold]gi Diagnostic Information[/bold]\n")
 
@@ -299,8 +307,7 @@ def doctor() -> None:
 
     if index_path.exists():
         try:
-            with index_path.open(encoding="utf-8") as f:
-                index_data = json.load(f)
+            index_data = load_json(index_path)
 
             fetched_at = index_data.get("fetched_at", "Unknown")
             source = index_data.get("source", "Unknown")
@@ -326,22 +333,50 @@ def doctor() -> None:
     else:
         console.print("Index exists: [red]No[/red]")
 
-    # Template cache files
-    template_files = list(cache_dir.glob("*.gitignore"))
+    # Template cache files and rendered combinations; scandir entries carry
+    # cached stat results, so one pass over the directory covers both.
+    # Global/ templates are cached in a subdirectory of their own
+    from .combine import COMBINED_CACHE_PREFIX
+
+    template_files = []
+    combined_mtimes = []
+    with os.scandir(cache_dir) as it:
+        for entry in it:
+            if entry.name.endswith(".gitignore"):
+                template_files.append((entry.name, entry))
+            elif entry.name.startswith(COMBINED_CACHE_PREFIX):
+                combined_mtimes.append(entry.stat().st_mtime)
+            elif entry.name == "Global" and entry.is_dir():
+                with os.scandir(entry.path) as global_it:
+                    template_files.extend(
+                        (f"Global/{global_entry.name}", global_entry)
+                        for global_entry in global_it
+                        if global_entry.name.endswith(".gitignore")
+                    )
+    template_files.sort(key=lambda item: item[0])
     console.print(f"Cached templates: [blue]{len(template_files)}[/blue]")
 
     if template_files:
         console.print("Cached template files:")
-        for template_file in sorted(template_files):
-            size = template_file.stat().st_size
+        for name, template_file in template_files:
+            stat = template_file.stat()
             mtime = time.strftime(
                 "%Y-%m-%d %H:%M:%S",
-                time.localtime(template_file.stat().st_mtime),
+                time.localtime(stat.st_mtime),
             )
             console.print(
-                f"  [cyan]{template_file.name}[/cyan] ({size} bytes, {mtime})",
+                f"  [cyan]{name}[/cyan] ({stat.st_size} bytes, {mtime})",
             )
 
+    # Stale combinations are pruned the next time a combination is cached
+    stale_before = time.time() - 24 * 3600
+    stale_count = sum(1 for mtime in combined_mtimes if mtime < stale_before)
+    console.print(
+        f"Cached combinations: [blue]{len(combined_mtimes)}[/blue] "
+        f"([green]{len(combined_mtimes) - stale_count} fresh[/green], "
+        f"[yellow]{stale_count} stale[/yellow])",
+    )
+
     # Test network connectivity
     console.print("\n[bold]Network Test[/bold]")
     try:
@@ -1,6 +1,26 @@
 """Combine and deduplicate .gitignore templates."""
 
+import hashlib
+import io
 import re
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from . import __version__
+from .util import atomic_write_bytes, is_stale_cache
+
+# Prefix of rendered combinations stored in the cache directory
+COMBINED_CACHE_PREFIX = "combined-"
+
+_WS_RE = re.compile(r"[ \t]+")
+
+# Markers wrapping each template's section in the generated file
+_SECTION_OPEN = "###> "
+_SECTION_CLOSE = "###< "
+_MARKER_LEN = len(_SECTION_OPEN)
+
+# Line classes used by deduplicate_lines
+_BLANK, _COMMENT, _RULE = 0, 1, 2
 
 
 def parse_lines(text: str) -> list[str]:
@@ -16,7 +36,7 @@ def normalize_line(line: str) -> str:
     # For non-comment lines, normalize internal whitespace
     if not line.startswith("#") and line.strip():
         # Collapse multiple spaces to single space, but preserve brackets
-        line = re.sub(r"[ \t]+", " ", line)
+        line = _WS_RE.sub(" ", line)
 
     return line
 
@@ -32,99 +52,110 @@ def should_preserve_line(line: str) -> bool:
     return line.strip() != ""
 
 
-def deduplicate_lines(templates_content: dict[str, str]) -> list[str]:
-    """Deduplicate lines across templates, preserving first occurrence."""
+def _classify_lines(lines: list[str]) -> list[int]:
+    """Tag each line as blank, comment or rule in a single pass."""
+    tags = []
+    for line in lines:
+        stripped = line.strip()
+        if not stripped:
+            tags.append(_BLANK)
+        elif stripped[0] == "#":
+            tags.append(_COMMENT)
+        else:
+            tags.append(_RULE)
+    return tags
+
+
+def _iter_deduplicated_lines(templates_content: dict[str, str]) -> Iterator[str]:
+    """Yield deduplicated lines across templates, preserving first occurrence."""
     seen_lines: set[str] = set()
-    result_lines: list[str] = []
 
     for template_name, content in templates_content.items():
         lines = parse_lines(content)
+        tags = _classify_lines(lines)
+        line_count = len(lines)
 
         # Add section header
-        result_lines.append(f"###> {template_name}.gitignore")
+        yield f"{_SECTION_OPEN}{template_name}.gitignore"
 
         i = 0
-        while i < len(lines):
+        while i < line_count:
             line = lines[i]
-            normalized = normalize_line(line)
+            tag = tags[i]
 
             # Handle comment blocks - try to keep them with their associated rules
-            if line.strip().startswith("#"):
-                comment_lines = [line]
-                j = i + 1
-
+            if tag == _COMMENT:
                 # Collect consecutive comment lines
-                while j < len(lines) and lines[j].strip().startswith("#"):
-                    comment_lines.append(lines[j])
+                j = i + 1
+                while j < line_count and tags[j] == _COMMENT:
                     j += 1
+                comment_lines = lines[i:j]
+                comment_block = "\n".join(comment_lines)
 
                 # Look for the next non-blank, non-comment line
-                next_rule_line = None
                 k = j
-                while k < len(lines):
-                    if not is_blank_line(lines[k]) and not lines[k].strip().startswith(
-                        "#",
-                    ):
-                        next_rule_line = lines[k]
-                        break
+                while k < line_count and tags[k] != _RULE:
                     k += 1
 
                 # If we found a rule line, check if the whole comment block + rule is unique
-                if next_rule_line:
-                    comment_block = "\n".join(comment_lines)
+                if k < line_count:
+                    next_rule_line = lines[k]
                     rule_normalized = normalize_line(next_rule_line)
                     combined_key = f"{comment_block}\n{rule_normalized}"
 
                     if combined_key not in seen_lines:
                         seen_lines.add(combined_key)
-                        result_lines.extend(comment_lines)
-                        result_lines.append(next_rule_line)
-                        i = k + 1
-                        continue
+                        yield from comment_lines
+                        yield next_rule_line
                     # Skip the comment block and rule
                     i = k + 1
                     continue
                 # No associated rule, just add comments if unique
-                comment_block = "\n".join(comment_lines)
                 if comment_block not in seen_lines:
                     seen_lines.add(comment_block)
-                    result_lines.extend(comment_lines)
+                    yield from comment_lines
                 i = j
                 continue
 
             # Handle regular lines
-            if should_preserve_line(line):
+            if tag == _RULE:
+                normalized = normalize_line(line)
                 if normalized not in seen_lines:
                     seen_lines.add(normalized)
-                    result_lines.append(line)
+                    yield line
             else:
                 # Blank line - add it
-                result_lines.append(line)
+                yield line
 
             i += 1
 
         # Add section footer
-        result_lines.append(f"###< {template_name}.gitignore")
-        result_lines.append("")  # Add blank line between sections
+        yield f"{_SECTION_CLOSE}{template_name}.gitignore"
+        yield ""  # Add blank line between sections
 
-    return result_lines
 
+def deduplicate_lines(templates_content: dict[str, str]) -> list[str]:
+    """Deduplicate lines across templates, preserving first occurrence."""
+    return list(_iter_deduplicated_lines(templates_content))
 
-def collapse_blank_lines(lines: list[str]) -> list[str]:
-    """Collapse runs of more than 2 blank lines to maximum 1."""
-    result = []
+
+def _iter_collapsed_lines(lines: Iterable[str]) -> Iterator[str]:
+    """Yield lines with runs of blank lines collapsed to a single one."""
     blank_count = 0
 
     for line in lines:
         if is_blank_line(line):
             blank_count += 1
             if blank_count <= 1:
-                result.append(line)
+                yield line
         else:
             blank_count = 0
-            result.append(line)
+            yield line
 
-    return result
+
+def collapse_blank_lines(lines: list[str]) -> list[str]:
+    """Collapse runs of more than 2 blank lines to maximum 1."""
+    return list(_iter_collapsed_lines(lines))
 
 
 def merge_with_existing(
@@ -143,35 +174,30 @@ def merge_with_existing(
     existing_lines = parse_lines(existing_text)
     new_lines = parse_lines(new_text)
 
-    # Find existing gi-generated sections to avoid duplicates
-    existing_sections = set()
-    i = 0
-    while i < len(existing_lines):
-        line = existing_lines[i]
-        if line.startswith("###> "):
-            section_name = line[5:]
-            existing_sections.add(section_name)
-            # Skip to end of section
-            while i < len(existing_lines) and not existing_lines[i].startswith("###< "):
-                i += 1
-        i += 1
+    # Find existing gi-generated sections to avoid duplicates, skipping over
+    # the body of each section in the same pass
+    section_names = set()
+    in_section = False
+    for line in existing_lines:
+        if in_section:
+            in_section = not line.startswith(_SECTION_CLOSE)
+        elif line.startswith(_SECTION_OPEN):
+            section_names.add(line[_MARKER_LEN:])
+            in_section = True
+    existing_sections = frozenset(section_names)
 
     # Filter out sections that already exist
     filtered_new_lines = []
-    i = 0
-    while i < len(new_lines):
-        line = new_lines[i]
-        if line.startswith("###> "):
-            section_name = line[5:]
-            if section_name in existing_sections:
-                # Skip this entire section
-                while i < len(new_lines) and not new_lines[i].startswith("###< "):
-                    i += 1
-                if i < len(new_lines):
-                    i += 1  # Skip the ###< line
-                continue
+    skipping = False
+    for line in new_lines:
+        if skipping:
+            # Skip this entire section, including its ###< line
+            skipping = not line.startswith(_SECTION_CLOSE)
+            continue
+        if line.startswith(_SECTION_OPEN) and line[_MARKER_LEN:] in existing_sections:
+            skipping = True
+            continue
         filtered_new_lines.append(line)
-        i += 1
 
     # Combine existing and new content
     combined_lines = existing_lines + filtered_new_lines
@@ -204,6 +230,66 @@ def generate_header(
 """
 
 
+def _render_body(templates_content: dict[str, str]) -> str:
+    """Render the deduplicated template sections, without the header."""
+    # Stream deduplicated lines through the blank-line filter straight into
+    # the output buffer
+    buffer = io.StringIO()
+    lines = _iter_collapsed_lines(_iter_deduplicated_lines(templates_content))
+    buffer.write(next(lines, ""))
+    for line in lines:
+        buffer.write("\n")
+        buffer.write(line)
+    return buffer.getvalue()
+
+
+def _combined_cache_path(cache_dir: Path, templates_content: dict[str, str]) -> Path:
+    """Get the cache path for a rendered combination of templates."""
+    # Template order determines section order, so it is part of the key; the
+    # version is too, so an upgrade never serves a render from older code
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{__version__}\0".encode())
+    for template_name, content in templates_content.items():
+        digest.update(f"{template_name}\0{content}\0".encode())
+    return cache_dir / f"{COMBINED_CACHE_PREFIX}{digest.hexdigest()}.txt"
+
+
+def prune_combined_cache(cache_dir: Path) -> int:
+    """Remove stale rendered combinations from the cache directory."""
+    removed = 0
+    for cache_path in cache_dir.glob(f"{COMBINED_CACHE_PREFIX}*.txt"):
+        if is_stale_cache(cache_path):
+            try:
+                cache_path.unlink()
+            except OSError:
+                continue
+            removed += 1
+    return removed
+
+
+def _cached_render_body(templates_content: dict[str, str], cache_dir: Path) -> str:
+    """Render the template sections, reusing a previous identical render."""
+    cache_path = _combined_cache_path(cache_dir, templates_content)
+    if not is_stale_cache(cache_path):
+        try:
+            return cache_path.read_text(encoding="utf-8")
+        except OSError:
+            pass
+
+    body = _render_body(templates_content)
+
+    # Every new combination adds an entry, so drop stale ones before writing;
+    # write atomically so a concurrent run never reads a partial render
+    try:
+        prune_combined_cache(cache_dir)
+        atomic_write_bytes(cache_path, body.encode("utf-8"))
+    except OSError:
+        # Cache write failed, but we can still return the content
+        pass
+
+    return body
+
+
 def combine_templates(
     templates_content: dict[str, str],
     existing_content: str = "",
@@ -211,23 +297,21 @@ def combine_templates(
     append: bool = False,
     include_header: bool = True,
     source_url: str = "github/gitignore (HEAD)",
+    cache_dir: Path | None = None,
 ) -> str:
     """Combine multiple .gitignore templates into a single file."""
     if not templates_content:
         return existing_content or ""
 
-    # Deduplicate lines across templates
-    deduplicated_lines = deduplicate_lines(templates_content)
-
-    # Collapse excessive blank lines
-    deduplicated_lines = collapse_blank_lines(deduplicated_lines)
-
-    # Generate the combined content
+    # Generate the combined content; with a cache_dir the rendered sections are
+    # reused across runs, while the timestamped header is always regenerated
+    if cache_dir is None:
+        combined_content = _render_body(templates_content)
+    else:
+        combined_content = _cached_render_body(templates_content, cache_dir)
     if include_header:
         header = generate_header(list(templates_content.keys()), source_url)
-        combined_content = header + "\n".join(deduplicated_lines)
-    else:
-        combined_content = "\n".join(deduplicated_lines)
+        combined_content = header + combined_content
 
     # Ensure single trailing newline
     if combined_content and not combined_content.endswith("\n"):
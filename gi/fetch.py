@@ -2,19 +2,54 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING
 
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from . import __version__
 from .util import (
+    atomic_write_bytes,
+    dump_json,
     get_index_cache_path,
     get_template_cache_path,
     is_stale_cache,
+    load_json,
 )
 
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from pathlib import Path
+
+
+def _decode_text(data: bytes) -> str:
+    """Decode a template body, tolerating stray invalid bytes."""
+    return data.decode("utf-8", errors="replace")
+
+
+def _read_text(path: Path) -> str:
+    """Read a cached template with a single binary read."""
+    return _decode_text(path.read_bytes())
+
+
+def _body_digest(body: bytes) -> str:
+    """Digest a cached template body so damage is detected before reuse."""
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+def _is_global(template: dict) -> bool:
+    """Check whether an index entry is a Global/ template."""
+    if "is_global" in template:
+        return template["is_global"]
+    # Indexes cached before the flag was recorded only carry the path
+    return template.get("path", template["name"]).startswith("Global/")
+
 
 class GitIgnoreFetcher:
     """Handles fetching and caching .gitignore templates."""
@@ -32,194 +67,387 @@ class GitIgnoreFetcher:
             total=3,
             backoff_factor=1,
             status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=frozenset(["GET"]),
+            raise_on_status=False,
+            respect_retry_after_header=True,
+        )
+        # Size the pool for concurrent template fetches so connections are
+        # kept alive and reused instead of re-handshaking per request
+        adapter = HTTPAdapter(
+            max_retries=retry_strategy,
+            pool_connections=16,
+            pool_maxsize=32,
+            pool_block=False,
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
+        self.session.headers.update(
+            {
+                "User-Agent": f"gi/{__version__}",
+                "Accept-Encoding": "gzip",
+                "Connection": "keep-alive",
+            },
+        )
 
-        # Set a reasonable timeout
-        self.session.timeout = 30
+        # Set a reasonable (connect, read) timeout; an unreachable host fails
+        # fast while slow downloads still get time. requests ignores a timeout
+        # set on the session itself, so it is passed to every request explicitly
+        self.timeout = (5, 30)
+
+        # In-process memo of the index and the names derived from it
+        self._index_cache: dict | None = None
+        self._index_lock = threading.Lock()
+        self._names_index: dict | None = None
+        self._template_names: tuple[str, ...] = ()
+        self._folded_names: list[tuple[str, str]] = []
+        self._by_name: dict[str, dict] = {}
+        self._name_to_path: dict[str, str] = {}
+        self._global_names: frozenset[str] = frozenset()
+        self._template_mem: dict[str, str] = {}
+
+    def close(self) -> None:
+        """Close the pooled HTTP connections held by the session."""
+        self.session.close()
 
     def get_index(self, *, force: bool = False) -> dict:
         """Get the list of available templates from GitHub API."""
+        if not force and self._index_cache is not None:
+            return self._index_cache
+
+        # Concurrent template fetches all resolve through the index; let the
+        # first caller load it and have the others wait for that result
+        with self._index_lock:
+            if not force and self._index_cache is not None:
+                return self._index_cache
+            return self._load_index(force=force)
+
+    def _load_index(self, *, force: bool) -> dict:
+        """Load the index from the disk cache or GitHub and memoize it."""
         cache_path = get_index_cache_path()
 
         # Check cache first (unless forced or stale)
         if not force and cache_path.exists() and not is_stale_cache(cache_path):
             try:
-                with cache_path.open(encoding="utf-8") as f:
-                    return json.load(f)
+                self._index_cache = load_json(cache_path)
+                return self._index_cache
             except (json.JSONDecodeError, OSError):
                 # Cache is corrupted, fetch fresh
                 pass
 
-        # Fetch from GitHub API
-        try:
-            response = self.session.get(self.api_base)
-            response.raise_for_status()
+        # Send the ETags recorded with the previous index so unchanged
+        # listings come back as bodiless 304 responses
+        previous = None
+        if cache_path.exists():
+            try:
+                previous = load_json(cache_path)
+            except (json.JSONDecodeError, OSError):
+                pass
+        etags = previous.get("etags", {}) if previous else {}
+        global_url = f"{self.api_base}/Global"
 
-            # Parse the response to find all .gitignore files
-            templates = []
-            for item in response.json():
-                if item["type"] == "file" and item["name"].endswith(".gitignore"):
-                    templates.append(
-                        {
-                            "name": item["name"],
-                            "path": item["path"],
-                            "download_url": item["download_url"],
-                            "size": item["size"],
-                        },
-                    )
-                elif item["type"] == "dir" and item["name"] == "Global":
-                    # Fetch Global directory contents
-                    global_response = self.session.get(item["url"])
-                    global_response.raise_for_status()
-
-                    for global_item in global_response.json():
-                        if global_item["type"] == "file" and global_item[
-                            "name"
-                        ].endswith(".gitignore"):
-                            templates.append(
-                                {
-                                    "name": global_item["name"],
-                                    "path": global_item["path"],
-                                    "download_url": global_item["download_url"],
-                                    "size": global_item["size"],
-                                },
-                            )
-
-            # Create index data
-            index_data = {
-                "fetched_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-                "source": self.api_base,
-                "templates": templates,
-            }
+        # Fetch from GitHub API, requesting the Global/ listing alongside the
+        # root listing so the two round-trips overlap
+        try:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                global_future = executor.submit(
+                    self._get_listing,
+                    global_url,
+                    etags.get(global_url),
+                )
+                response = self._get_listing(self.api_base, etags.get(self.api_base))
+                response.raise_for_status()
+
+            if response.status_code == requests.codes.not_modified and (
+                global_url not in etags
+                or global_future.result().status_code == requests.codes.not_modified
+            ):
+                # Nothing changed upstream; reuse the previous listing
+                index_data = {
+                    **previous,
+                    "fetched_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                }
+            else:
+                index_data = self._build_index(response, global_future)
 
             # Cache the result
             try:
-                with cache_path.open("w", encoding="utf-8") as f:
-                    json.dump(index_data, f, indent=2)
+                dump_json(cache_path, index_data)
             except OSError:
                 # Cache write failed, but we can still return the data
                 pass
-            else:
-                return index_data
+
+            self._index_cache = index_data
+            return index_data
 
         except requests.RequestException as e:
             # If we have cached data, use it even if stale
             if cache_path.exists():
                 try:
-                    with cache_path.open(encoding="utf-8") as f:
-                        return json.load(f)
+                    self._index_cache = load_json(cache_path)
+                    return self._index_cache
                 except (json.JSONDecodeError, OSError):
                     pass
 
             error_msg = f"Failed to fetch template index: {e}"
             raise RuntimeError(error_msg) from e
 
-    def resolve_template_path(self, template_name: str) -> str:
-        """Resolve a template name to its actual path in the repository."""
-        index = self.get_index()
-        templates = index.get("templates", [])
+    def _get_listing(self, url: str, etag: str | None = None) -> requests.Response:
+        """Request a contents listing, conditionally if an ETag is known."""
+        headers = {"If-None-Match": etag} if etag else None
+        return self.session.get(url, headers=headers, timeout=self.timeout)
 
-        # Create a mapping from template names to their paths
+    def _build_index(
+        self,
+        response: requests.Response,
+        global_future: Future[requests.Response],
+    ) -> dict:
+        """Build index data from the root and Global/ listing responses."""
+        global_url = f"{self.api_base}/Global"
+
+        # A conditional request that came back unchanged has no body to parse
+        if response.status_code == requests.codes.not_modified:
+            response = self._get_listing(self.api_base)
+            response.raise_for_status()
+        etags = {}
+        if "ETag" in response.headers:
+            etags[self.api_base] = response.headers["ETag"]
+
+        # Parse the response to find all .gitignore files
+        templates = []
+        for item in response.json():
+            if item["type"] == "file" and item["name"].endswith(".gitignore"):
+                templates.append(
+                    {
+                        "name": item["name"],
+                        "path": item["path"],
+                        "download_url": item["download_url"],
+                        "size": item["size"],
+                        "is_global": False,
+                    },
+                )
+            elif item["type"] == "dir" and item["name"] == "Global":
+                # Global directory contents were fetched concurrently
+                global_response = global_future.result()
+                if global_response.status_code == requests.codes.not_modified:
+                    global_response = self._get_listing(global_url)
+                global_response.raise_for_status()
+                if "ETag" in global_response.headers:
+                    etags[global_url] = global_response.headers["ETag"]
+
+                for global_item in global_response.json():
+                    if global_item["type"] == "file" and global_item["name"].endswith(
+                        ".gitignore"
+                    ):
+                        templates.append(
+                            {
+                                "name": global_item["name"],
+                                "path": global_item["path"],
+                                "download_url": global_item["download_url"],
+                                "size": global_item["size"],
+                                "is_global": True,
+                            },
+                        )
+
+        return {
+            "fetched_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "source": self.api_base,
+            "templates": templates,
+            "etags": etags,
+        }
+
+    def _refresh_index_views(self, index: dict) -> None:
+        """Rebuild the lookups derived from the index if it has changed."""
+        if index is self._names_index:
+            return
+
+        names = []
+        by_name = {}
         name_to_path = {}
-        for template in templates:
+        global_names = set()
+        for template in index.get("templates", []):
             name = template["name"].removesuffix(".gitignore")
-            path = template["path"].removesuffix(".gitignore")
+            path = template.get("path", template["name"]).removesuffix(".gitignore")
+            names.append(name)
+            by_name.setdefault(name, template)
+            # Map both the name and the path itself to the path
             name_to_path[name] = path
-            # Also map the path to itself
             name_to_path[path] = path
+            if _is_global(template):
+                global_names.add(name)
+
+        self._template_names = tuple(names)
+        self._folded_names = [(name, name.casefold()) for name in names]
+        self._by_name = by_name
+        self._name_to_path = name_to_path
+        self._global_names = frozenset(global_names)
+        # Set last so concurrent readers never pair it with older views
+        self._names_index = index
+
+    def resolve_template_path(self, template_name: str) -> str:
+        """Resolve a template name to its actual path in the repository."""
+        self._refresh_index_views(self.get_index())
 
         # Return the resolved path or the original name if not found
-        return name_to_path.get(template_name, template_name)
+        return self._name_to_path.get(template_name, template_name)
 
     def get_template(self, template_name: str, *, no_cache: bool = False) -> str:
         """Get a specific template, using cache when possible."""
+        # Templates already loaded by this process are served from memory
+        if not no_cache and template_name in self._template_mem:
+            return self._template_mem[template_name]
+
         # Resolve the template name to its actual path
         resolved_name = self.resolve_template_path(template_name)
         cache_path = get_template_cache_path(resolved_name)
 
         # Try cache first (unless no_cache is specified)
-        if not no_cache and cache_path.exists():
+        if not no_cache:
             try:
-                with cache_path.open(encoding="utf-8") as f:
-                    return f.read()
+                content = _read_text(cache_path)
             except OSError:
-                # Cache read failed, continue to fetch
+                # Cache missing or unreadable, continue to fetch
                 pass
+            else:
+                self._template_mem[template_name] = content
+                return content
 
-        # Fetch from GitHub using the resolved path
+        # Fetch from GitHub using the resolved path, revalidating the cached
+        # copy with its ETag so an unchanged template costs no body transfer.
+        # The ETag is only sent while the cached body still matches the digest
+        # stored with it, so a damaged cache is always downloaded again
         url = f"{self.base_url}/{resolved_name}.gitignore"
+        etag_path = cache_path.with_suffix(".etag")
+        headers = None
+        cached_body = b""
+        try:
+            etag, digest = etag_path.read_text(encoding="utf-8").split("\n")
+            cached_body = cache_path.read_bytes()
+        except (OSError, ValueError):
+            pass
+        else:
+            if _body_digest(cached_body) == digest:
+                headers = {"If-None-Match": etag}
 
         try:
-            response = self.session.get(url)
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+            if headers and response.status_code == requests.codes.not_modified:
+                content = _decode_text(cached_body)
+                self._template_mem[template_name] = content
+                return content
             response.raise_for_status()
-            content = response.text
+            # Keep the raw body for the cache and decode it once for callers
+            body = response.content
+            content = _decode_text(body)
 
-            # Cache the result
+            # Cache the result; Global/ templates live in a subdirectory
             try:
-                with cache_path.open("w", encoding="utf-8") as f:
-                    f.write(content)
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                atomic_write_bytes(cache_path, body)
+                if "ETag" in response.headers:
+                    etag_path.write_text(
+                        f"{response.headers['ETag']}\n{_body_digest(body)}",
+                        encoding="utf-8",
+                    )
+                else:
+                    etag_path.unlink(missing_ok=True)
             except OSError:
                 # Cache write failed, but we can still return the content
                 pass
 
+            self._template_mem[template_name] = content
             return content
 
         except requests.RequestException as e:
             # If we have cached content, use it
             if cache_path.exists():
                 try:
-                    with cache_path.open(encoding="utf-8") as f:
-                        return f.read()
+                    return _read_text(cache_path)
                 except OSError:
                     pass
 
             error_msg = f"Failed to fetch template '{template_name}': {e}"
             raise RuntimeError(error_msg) from e
 
+    def get_templates(
+        self,
+        template_names: Iterable[str],
+        *,
+        no_cache: bool = False,
+    ) -> Iterator[tuple[str, Future[str]]]:
+        """Fetch several templates concurrently, yielding each as it completes."""
+        names = list(dict.fromkeys(template_names))
+        if not names:
+            return
+
+        # Workers share the session, so each reuses a pooled connection
+        with ThreadPoolExecutor(max_workers=min(16, len(names))) as executor:
+            futures = {
+                executor.submit(self.get_template, name, no_cache=no_cache): name
+                for name in names
+            }
+            for future in as_completed(futures):
+                yield futures[future], future
+
     def get_template_info(self, template_name: str) -> dict | None:
         """Get information about a specific template from the index."""
         try:
             index = self.get_index()
-            for template in index["templates"]:
-                if template["name"] == f"{template_name}.gitignore":
-                    return template
         except RuntimeError:
-            pass
+            return None
 
-        return None
+        self._refresh_index_views(index)
+        return self._by_name.get(template_name)
 
     def list_templates(self) -> list[str]:
         """Get a list of all available template names."""
         try:
             index = self.get_index()
-            return [
-                template["name"][:-10] for template in index["templates"]
-            ]  # Remove .gitignore suffix
         except RuntimeError:
             return []
 
+        self._refresh_index_views(index)
+        return list(self._template_names)
+
+    def global_template_names(self) -> frozenset[str]:
+        """Get the names of templates that live under Global/."""
+        try:
+            index = self.get_index()
+        except RuntimeError:
+            return frozenset()
+
+        self._refresh_index_views(index)
+        return self._global_names
+
     def search_templates(self, query: str) -> list[str]:
         """Search for templates matching a query."""
-        query_lower = query.lower()
-        templates = self.list_templates()
+        try:
+            index = self.get_index()
+        except RuntimeError:
+            return []
 
-        # Simple substring search
-        return [template for template in templates if query_lower in template.lower()]
+        # Case-insensitive substring search against names folded once per index
+        self._refresh_index_views(index)
+        query_folded = query.casefold()
+        return [name for name, folded in self._folded_names if query_folded in folded]
 
 
 # Global fetcher instance
-_fetcher = GitIgnoreFetcher()
+_fetcher: GitIgnoreFetcher | None = None
 
 
 def get_fetcher() -> GitIgnoreFetcher:
     """Get the global fetcher instance."""
+    global _fetcher
+    # Created on first use so importing gi doesn't set up an HTTP session
+    if _fetcher is None:
+        _fetcher = GitIgnoreFetcher()
     return _fetcher
 
 
 def set_fetcher(fetcher: GitIgnoreFetcher) -> None:
     """Set the global fetcher instance (mainly for testing)."""
     global _fetcher
+    # Release the connections of the fetcher being replaced
+    if _fetcher is not None and _fetcher is not fetcher:
+        _fetcher.close()
     _fetcher = fetcher
@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import functools
+import re
+
 # Mapping of common aliases to official template names
 ALIASES: dict[str, str] = {
     "cpp": "C++",
@@ -120,21 +123,31 @@ ALIASES: dict[str, str] = {
     "p4z": "Perforce",
 }
 
+# Casefolded view of ALIASES for case-insensitive lookups
+_ALIASES_FOLDED: dict[str, str] = {
+    key.casefold(): value for key, value in ALIASES.items()
+}
+
+# Translation table turning underscores and dashes into spaces
+_SEPARATOR_TABLE = str.maketrans("_-", "  ")
+
+# Runs of characters that are neither commas nor whitespace
+_TOKEN_RE = re.compile(r"[^,\s]+")
 
+
+@functools.lru_cache(maxsize=1024)
 def normalize_template_name(name: str) -> str:
     """Normalize a template name to its canonical form."""
     # Remove .gitignore suffix if present
     name = name.removesuffix(".gitignore")
 
-    # Convert to lowercase for case-insensitive matching
-    name_lower = name.lower()
-
-    # Check aliases first
-    if name_lower in ALIASES:
-        return ALIASES[name_lower]
+    # Check aliases first, matching case-insensitively
+    alias = _ALIASES_FOLDED.get(name.casefold())
+    if alias is not None:
+        return alias
 
     # Convert underscores and dashes to spaces, then title case
-    normalized = name.replace("_", " ").replace("-", " ").strip()
+    normalized = name.translate(_SEPARATOR_TABLE).strip()
 
     # Handle special cases for Global/ templates
     if normalized.startswith("global/"):
@@ -155,22 +168,10 @@ def normalize_template_name(name: str) -> str:
 
 def parse_template_names(input_str: str) -> list[str]:
     """Parse a string of template names, handling both spaces and commas."""
-    # Split by both commas and spaces, then clean up
-    names = []
-    for part in input_str.replace(",", " ").split():
-        cleaned_part = part.strip()
-        if cleaned_part:
-            names.append(cleaned_part)
-
-    return names
+    return _TOKEN_RE.findall(input_str)
 
 
 def resolve_template_names(names: list[str]) -> list[str]:
     """Resolve a list of template names to their canonical forms."""
-    resolved = []
-    for name in names:
-        canonical = normalize_template_name(name)
-        if canonical not in resolved:  # Avoid duplicates
-            resolved.append(canonical)
-
-    return resolved
+    # dict.fromkeys drops duplicates while keeping first-seen order
+    return list(dict.fromkeys(normalize_template_name(name) for name in names))
@@ -2,15 +2,46 @@
 
 from __future__ import annotations
 
+import functools
+import json
+import os
 import platform
+import shutil
+import stat
 import sys
+import tempfile
+import time
 from pathlib import Path
 
-import platformdirs
-
-
+try:
+    import orjson
+except ImportError:
+    # orjson is not a declared dependency; it is only picked up as a speedup
+    # when already installed, and the stdlib json is the supported path
+    orjson = None
+
+# platform.system() names (lowercased) mapped to our OS identifiers
+_OS_NAMES: dict[str, str] = {
+    "windows": "windows",
+    "darwin": "macos",
+    "linux": "linux",
+}
+
+# OS-specific template mappings
+_OS_TEMPLATES: dict[str, tuple[str, ...]] = {
+    "windows": ("Windows",),
+    "macos": ("macOS",),
+    "linux": ("Linux",),
+}
+
+
+@functools.cache
 def get_cache_dir() -> Path:
     """Get the cache directory for gi."""
+    # platformdirs is only needed here, so keep it off the import path of
+    # commands that never touch the cache
+    import platformdirs
+
     if platform.system() == "Windows":
         # Use %LOCALAPPDATA%\gi\cache on Windows
         cache_dir = platformdirs.user_cache_dir("gi", "gi")
@@ -35,26 +66,93 @@ def get_template_cache_path(template_name: str) -> Path:
 
 def normalize_line_endings(text: str) -> str:
     """Normalize line endings to Unix style."""
+    # LF-only text is the common case; skip the copies entirely
+    if "\r" not in text:
+        return text
     return text.replace("\r\n", "\n").replace("\r", "\n")
 
 
 def ensure_trailing_newline(text: str) -> str:
     """Ensure text ends with exactly one newline."""
+    # Common case: already ends with a single newline after some content
+    if text.endswith("\n") and not text.endswith("\n\n") and text != "\n":
+        return text
+
     text = text.rstrip("\n")
     return text + "\n" if text else ""
 
 
 def is_stale_cache(cache_path: Path, max_age_hours: int = 24) -> bool:
     """Check if a cache file is stale."""
-    if not cache_path.exists():
+    try:
+        mtime = cache_path.stat().st_mtime
+    except FileNotFoundError:
         return True
 
-    import time
-
-    cache_age = time.time() - cache_path.stat().st_mtime
+    cache_age = time.time() - mtime
     return cache_age > (max_age_hours * 3600)
 
 
+def _read_umask() -> int:
+    """Read the process umask, which can only be done by resetting it."""
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+# Read once at import, before any worker threads start creating files
+_UMASK = _read_umask()
+
+
+def atomic_write_bytes(path: Path, data: bytes, *, fsync: bool = False) -> None:
+    """Write data to a file atomically via a temporary file and rename."""
+    # Write through symlinks (e.g. dotfile managers) instead of replacing them
+    path = path.resolve()
+    # A unique temp file per call, so concurrent writers to one path (e.g. a
+    # template requested under two names) never clobber each other's data
+    fd, tmp_name = tempfile.mkstemp(
+        dir=path.parent,
+        prefix=f".{path.name}.",
+        suffix=".tmp",
+    )
+    tmp_path = Path(tmp_name)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            if fsync:
+                # Make sure the data is on disk before the rename publishes it
+                f.flush()
+                os.fsync(f.fileno())
+        # mkstemp creates files as 0o600; an existing target keeps its
+        # permissions and a new one gets what a normal create would give
+        try:
+            mode = stat.S_IMODE(path.stat().st_mode)
+        except FileNotFoundError:
+            mode = 0o666 & ~_UMASK
+        tmp_path.chmod(mode)
+        tmp_path.replace(path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def load_json(path: Path) -> dict:
+    """Load a JSON cache file with a single binary read."""
+    data = path.read_bytes()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dump_json(path: Path, data: dict) -> None:
+    """Write a compact JSON cache file atomically with a single binary write."""
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_APPEND_NEWLINE)
+    else:
+        payload = (json.dumps(data, separators=(",", ":")) + "\n").encode("utf-8")
+    atomic_write_bytes(path, payload)
+
+
 def safe_write_file(path: Path, content: str, *, force: bool = False) -> bool:
     """Safely write content to a file, with optional force overwrite."""
     if path.exists() and not force:
@@ -63,109 +161,73 @@ def safe_write_file(path: Path, content: str, *, force: bool = False) -> bool:
     # Create parent directories if they don't exist
     path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Write the file
-    with path.open("w", encoding="utf-8") as f:
-        f.write(content)
+    # Write the file in one go, never leaving it partially written
+    atomic_write_bytes(path, content.encode("utf-8"), fsync=True)
 
     return True
 
 
 def read_existing_gitignore(path: Path) -> str | None:
     """Read existing .gitignore file if it exists."""
-    if not path.exists():
-        return None
-
     try:
-        with path.open(encoding="utf-8") as f:
-            return f.read()
+        return path.read_bytes().decode("utf-8")
     except (OSError, UnicodeDecodeError):
         return None
 
 
+@functools.cache
 def detect_operating_system() -> str:
     """Detect the current operating system."""
-    system = platform.system().lower()
-
-    if system == "windows":
-        return "windows"
-    if system == "darwin":
-        return "macos"
-    if system == "linux":
-        return "linux"
-    # Fallback for other systems
-    return "linux"
+    # Fallback to Linux for other systems
+    return _OS_NAMES.get(platform.system().lower(), "linux")
 
 
 def get_os_specific_templates() -> list[str]:
     """Get OS-specific .gitignore templates based on the current OS."""
     os_type = detect_operating_system()
-
-    # OS-specific template mappings
-    os_templates = {
-        "windows": [
-            "Windows",
-        ],
-        "macos": [
-            "macOS",
-        ],
-        "linux": [
-            "Linux",
-        ],
-    }
-
-    return os_templates.get(os_type, ["Linux"])
+    return list(_OS_TEMPLATES.get(os_type, ("Linux",)))
 
 
-def detect_development_environment() -> list[str]:
-    """Detect common development environments and return appropriate templates."""
+@functools.cache
+def _detect_installed_tools() -> tuple[str, ...]:
+    """Look up development tools on PATH, once per process."""
     templates = []
 
-    # Check for common development tools
-    try:
-        import subprocess
+    # Check for Node.js/npm
+    if shutil.which("node") and shutil.which("npm"):
+        templates.append("Node")
 
-        # Check for Node.js/npm
-        try:
-            subprocess.run(["node", "--version"], capture_output=True, check=True)
-            subprocess.run(["npm", "--version"], capture_output=True, check=True)
-            templates.append("Node")
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            pass
+    return tuple(templates)
 
-        # Check for Python
-        if sys.executable:
-            templates.append("Python")
 
-        # Check for Git
-        try:
-            subprocess.run(["git", "--version"], capture_output=True, check=True)
-            # Git is always available if we're using gi, so don't add a template
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            pass
+def _clear_detection_caches() -> None:
+    """Forget memoized environment detection results (mainly for testing)."""
+    detect_operating_system.cache_clear()
+    _detect_installed_tools.cache_clear()
+    _auto_detect_templates.cache_clear()
 
-    except ImportError:
-        # Fallback if subprocess is not available
-        pass
 
-    return templates
+def detect_development_environment() -> list[str]:
+    """Detect common development environments and return appropriate templates."""
+    templates = list(_detect_installed_tools())
 
+    # Check for Python
+    if sys.executable:
+        templates.append("Python")
 
-def get_auto_detect_templates() -> list[str]:
-    """Get automatically detected templates based on OS and development environment."""
-    templates = []
+    return templates
 
-    # Add OS-specific templates
-    templates.extend(get_os_specific_templates())
 
-    # Add development environment templates
-    templates.extend(detect_development_environment())
+@functools.cache
+def _auto_detect_templates() -> tuple[str, ...]:
+    """Detect templates for this machine, once per process."""
+    # OS-specific templates first, then development environment templates,
+    # dropping duplicates while preserving order
+    return tuple(
+        dict.fromkeys([*get_os_specific_templates(), *detect_development_environment()])
+    )
 
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_templates = []
-    for template in templates:
-        if template not in seen:
-            seen.add(template)
-            unique_templates.append(template)
 
-    return unique_templates
+def get_auto_detect_templates() -> list[str]:
+    """Get automatically detected templates based on OS and development environment."""
+    return list(_auto_detect_templates())
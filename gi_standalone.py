@@ -4,18 +4,20 @@
 import sys
 from pathlib import Path
 
-# Add the gi package to the path
+# Put the directory containing the gi package on the path; adding the
+# package directory itself would make its modules importable a second time
+# under top-level names (util, fetch, ...)
 if getattr(sys, "frozen", False):
     # Running as PyInstaller bundle
-    gi_path = Path(sys._MEIPASS) / "gi"
+    base_path = Path(sys._MEIPASS)
 else:
     # Running as script
-    gi_path = Path(__file__).parent / "gi"
+    base_path = Path(__file__).parent
 
-sys.path.insert(0, str(gi_path))
-
-# Import and run the CLI
-from gi.cli import app
+sys.path.insert(0, str(base_path))
 
 if __name__ == "__main__":
+    # Import the CLI only when running it, not when imported as a module
+    from gi.cli import app
+
     app()
@@ -0,0 +1,38 @@
+# ruff: noqa: INP001
+"""Shared helpers for reading the project version in release scripts."""
+
+import re
+from pathlib import Path
+
+_VERSION_PATTERN = r'^\s*version\s*=\s*["\']([^"\']+)["\']'
+_VERSION_RE = re.compile(_VERSION_PATTERN.encode(), re.MULTILINE)
+_VERSION_TEXT_RE = re.compile(_VERSION_PATTERN, re.MULTILINE)
+
+
+def find_project_version(data: bytes) -> str:
+    """Find the project version in the raw bytes of a pyproject.toml file."""
+    # Scan the raw bytes and decode only the matched version
+    match = _VERSION_RE.search(data)
+    if not match:
+        raise ValueError("Could not find version in pyproject.toml")
+
+    return match.group(1).decode("utf-8")
+
+
+def find_project_version_in_text(content: str) -> str:
+    """Find the project version in already-decoded pyproject.toml content."""
+    match = _VERSION_TEXT_RE.search(content)
+    if not match:
+        raise ValueError("Could not find version in pyproject.toml")
+
+    return match.group(1)
+
+
+def read_project_version(pyproject_path: Path) -> str:
+    """Read the project version from a pyproject.toml file."""
+    try:
+        data = pyproject_path.read_bytes()
+    except FileNotFoundError:
+        raise FileNotFoundError("pyproject.toml not found") from None
+
+    return find_project_version(data)
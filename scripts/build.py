@@ -1,10 +1,12 @@
 #!/usr/bin/env python3
 """Build script for creating cross-platform executables."""
 
+import os
 import platform
 import shutil
 import subprocess
 import sys
+import threading
 from pathlib import Path
 
 
@@ -16,14 +18,26 @@ def run_command(cmd, cwd=None):
     return result
 
 
+def remove_tree_in_background(path):
+    """Move a directory out of the way and delete it on a background thread."""
+    if not path.exists():
+        return
+
+    # The rename is instant, so the build can recreate the directory right
+    # away; the non-daemon thread still finishes before the interpreter exits
+    old_path = path.with_name(f".{path.name}.{os.getpid()}.old")
+    path.rename(old_path)
+    threading.Thread(
+        target=shutil.rmtree, args=(old_path,), kwargs={"ignore_errors": True}
+    ).start()
+
+
 def build_with_pyinstaller():
     """Build executable using PyInstaller."""
 
     # Clean previous builds
-    if Path("dist").exists():
-        shutil.rmtree("dist")
-    if Path("build").exists():
-        shutil.rmtree("build")
+    remove_tree_in_background(Path("dist"))
+    remove_tree_in_background(Path("build"))
 
     # PyInstaller command using spec file
     cmd = ["pyinstaller", "--clean", "gi.spec"]
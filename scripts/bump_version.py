@@ -6,19 +6,21 @@ import re
 import sys
 from pathlib import Path
 
+from _version import find_project_version_in_text
+
+_DUNDER_VERSION_RE = re.compile(r'__version__\s*=\s*["\'][^"\']+["\']')
 
-def get_current_version() -> str:
-    """Get the current version from pyproject.toml."""
-    pyproject_path = Path("pyproject.toml")
-    if not pyproject_path.exists():
-        raise FileNotFoundError("pyproject.toml not found")
 
-    content = pyproject_path.read_text()
-    match = re.search(r'version\s*=\s*["\']([^"\']+)["\']', content)
-    if not match:
-        raise ValueError("Could not find version in pyproject.toml")
+def get_current_version() -> tuple[str, str]:
+    """Get the current version and the full contents of pyproject.toml."""
+    pyproject_path = Path("pyproject.toml")
+    try:
+        # Text mode translates CRLF, which the line-based rewrite relies on
+        content = pyproject_path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        raise FileNotFoundError("pyproject.toml not found") from None
 
-    return match.group(1)
+    return find_project_version_in_text(content), content
 
 
 def bump_version(version: str, bump_type: str) -> str:
@@ -38,10 +40,9 @@ def bump_version(version: str, bump_type: str) -> str:
     raise ValueError(f"Invalid bump type: {bump_type}")
 
 
-def update_version_in_pyproject(new_version: str) -> None:
-    """Update version in pyproject.toml."""
+def update_version_in_pyproject(new_version: str, content: str) -> None:
+    """Update version in pyproject.toml, given its current contents."""
     pyproject_path = Path("pyproject.toml")
-    content = pyproject_path.read_text()
 
     # Only update the project version, not tool configurations
     # Look for version in the [project] section specifically
@@ -76,11 +77,7 @@ def update_version_in_init(new_version: str) -> None:
 
     # Look for __version__ = "..." pattern
     if "__version__" in content:
-        new_content = re.sub(
-            r'__version__\s*=\s*["\'][^"\']+["\']',
-            f'__version__ = "{new_version}"',
-            content,
-        )
+        new_content = _DUNDER_VERSION_RE.sub(f'__version__ = "{new_version}"', content)
         init_path.write_text(new_content)
         print(f"Updated gi/__init__.py version to {new_version}")
 
@@ -109,7 +106,7 @@ def main():
     args = parser.parse_args()
 
     try:
-        current_version = get_current_version()
+        current_version, pyproject_content = get_current_version()
         print(f"Current version: {current_version}")
 
         new_version = bump_version(current_version, args.bump_type)
@@ -120,7 +117,7 @@ def main():
             return
 
         # Update files
-        update_version_in_pyproject(new_version)
+        update_version_in_pyproject(new_version, pyproject_content)
         update_version_in_init(new_version)
         update_version_in_readme(new_version)
 
@@ -6,10 +6,15 @@ import subprocess
 import sys
 from pathlib import Path
 
+from _version import read_project_version
 
-def run_command(cmd, cwd=None, *, check=True):
+
+def run_command(cmd, cwd=None, *, check=True, capture=True):
     """Run a command and return the result."""
-    result = subprocess.run(cmd, cwd=cwd, capture_output=True, text=True, check=False)
+    # Without capture the command writes straight to our terminal
+    result = subprocess.run(
+        cmd, cwd=cwd, capture_output=capture, text=capture, check=False
+    )
     if check and result.returncode != 0:
         sys.exit(1)
     return result
@@ -17,18 +22,21 @@ def run_command(cmd, cwd=None, *, check=True):
 
 def get_version():
     """Get the current version from pyproject.toml."""
-    pyproject_path = Path("pyproject.toml")
-    if not pyproject_path.exists():
-        error_msg = "pyproject.toml not found"
-        raise FileNotFoundError(error_msg)
+    return read_project_version(Path("pyproject.toml"))
 
-    content = pyproject_path.read_text()
-    for line in content.split("\n"):
-        if line.strip().startswith("version = "):
-            return line.split("=")[1].strip().strip("\"'")
 
-    error_msg = "Version not found in pyproject.toml"
-    raise ValueError(error_msg)
+def get_repo_state():
+    """Get the current branch and whether the working tree is clean."""
+    # One git call reports both the branch and any changes
+    result = run_command(["git", "status", "--porcelain=v2", "--branch"], check=False)
+    current_branch = ""
+    clean = True
+    for line in result.stdout.splitlines():
+        if line.startswith("# branch.head "):
+            current_branch = line.removeprefix("# branch.head ")
+        elif not line.startswith("#"):
+            clean = False
+    return current_branch, clean
 
 
 def create_tag(version, message=None):
@@ -42,14 +50,14 @@ def create_tag(version, message=None):
         return False
 
     # Create and push tag
-    run_command(["git", "tag", "-a", f"v{version}", "-m", message])
-    run_command(["git", "push", "origin", f"v{version}"])
+    run_command(["git", "tag", "-a", f"v{version}", "-m", message], capture=False)
+    run_command(["git", "push", "origin", f"v{version}"], capture=False)
     return True
 
 
 def build_local():
     """Build executables locally for testing."""
-    run_command([sys.executable, "scripts/build.py"])
+    run_command([sys.executable, "scripts/build.py"], capture=False)
 
 
 def main():
@@ -86,15 +94,9 @@ def main():
         if args.dry_run:
             return
 
-        # Check if we're on main branch
-        result = run_command(["git", "branch", "--show-current"], check=False)
-        current_branch = result.stdout.strip()
-        if current_branch != "main":
-            return
-
-        # Check if working directory is clean
-        result = run_command(["git", "status", "--porcelain"], check=False)
-        if result.stdout.strip():
+        # Only tag from a clean main branch
+        current_branch, clean = get_repo_state()
+        if current_branch != "main" or not clean:
             return
 
         create_tag(version, args.message)
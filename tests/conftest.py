@@ -0,0 +1,11 @@
+"""Shared pytest fixtures."""
+
+import pytest
+import responses
+
+
+@pytest.fixture
+def mocked_responses():
+    """Intercept HTTP requests made through requests for one test."""
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as rsps:
+        yield rsps
@@ -1,6 +1,13 @@
 """Tests for the combine module."""
 
+import os
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
 from gi.combine import (
+    _combined_cache_path,
     combine_templates,
     deduplicate_lines,
     generate_header,
@@ -31,6 +38,14 @@ class TestParseLines:
         lines = parse_lines(text)
         assert lines == ["line1", "line2", "line3", ""]
 
+    def test_parse_lines_empty(self):
+        """Test parsing empty text."""
+        assert parse_lines("") == [""]
+
+    def test_parse_lines_only_splits_on_cr_lf(self):
+        """Test other line-break characters stay inside the line."""
+        assert parse_lines("foo\x0cbar\u2028baz\n") == ["foo\x0cbar\u2028baz", ""]
+
 
 class TestNormalizeLine:
     """Test line normalization functionality."""
@@ -157,6 +172,19 @@ class TestMergeWithExisting:
         assert "existing line" in result
         assert "new line" in result
 
+    def test_merge_append_skips_existing_sections(self):
+        """Test sections already present in the existing file are not re-added."""
+        existing = "###> Python.gitignore\n*.pyc\n###< Python.gitignore\n"
+        new = (
+            "###> Python.gitignore\n*.py\n###< Python.gitignore\n"
+            "###> Rust.gitignore\ntarget/\n###< Rust.gitignore\n"
+        )
+        result = merge_with_existing(existing, new, "append")
+
+        assert result.count("###> Python.gitignore") == 1
+        assert "*.py\n" not in result
+        assert "###> Rust.gitignore\ntarget/\n###< Rust.gitignore\n" in result
+
 
 class TestCombineTemplates:
     """Test the main combine_templates function."""
@@ -179,6 +207,18 @@ class TestCombineTemplates:
         assert "*.py" in result
         assert "__pycache__/" in result
 
+    def test_combine_single_template_is_deduplicated(self):
+        """Test a single template still goes through deduplication."""
+        templates = {
+            "Python": "*.pyc\n*.pyc\n# C extensions\n\n*.so\n",
+        }
+        result = combine_templates(templates, include_header=False)
+
+        assert result == (
+            "###> Python.gitignore\n*.pyc\n# C extensions\n*.so\n\n"
+            "###< Python.gitignore\n"
+        )
+
     def test_combine_multiple_templates(self):
         """Test combining multiple templates."""
         templates = {
@@ -218,3 +258,77 @@ class TestCombineTemplates:
         assert "generated by gi" not in result
         assert "###> Python.gitignore" in result
         assert "*.py" in result
+
+    def test_combine_with_cache_dir(self):
+        """Test rendered sections are cached and reused."""
+        templates = {
+            "Python": "*.py\n__pycache__/\n",
+            "Rust": "*.py\ntarget/\n",
+        }
+        expected = combine_templates(templates, include_header=False)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_dir = Path(temp_dir)
+            result = combine_templates(
+                templates,
+                include_header=False,
+                cache_dir=cache_dir,
+            )
+            assert result == expected
+            assert len(list(cache_dir.glob("combined-*.txt"))) == 1
+
+            with patch("gi.combine._render_body") as mock_render:
+                cached = combine_templates(
+                    templates,
+                    include_header=False,
+                    cache_dir=cache_dir,
+                )
+                mock_render.assert_not_called()
+            assert cached == expected
+
+    def test_combine_cache_key_includes_version(self):
+        """Test a render cached by another gi version is not reused."""
+        templates = {"Python": "*.py\n"}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_dir = Path(temp_dir)
+            with patch("gi.combine.__version__", "0.0.0"):
+                old_path = _combined_cache_path(cache_dir, templates)
+            assert _combined_cache_path(cache_dir, templates) != old_path
+
+    def test_combine_cache_prunes_stale_entries(self):
+        """Test stale cached renders are ignored and pruned on write."""
+        templates = {"Python": "*.py\n"}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_dir = Path(temp_dir)
+            cache_path = _combined_cache_path(cache_dir, templates)
+            cache_path.write_text("stale render", encoding="utf-8")
+            orphan = cache_dir / "combined-0123.txt"
+            orphan.write_text("orphan", encoding="utf-8")
+            old = time.time() - 48 * 3600
+            for path in (cache_path, orphan):
+                os.utime(path, (old, old))
+
+            result = combine_templates(
+                templates,
+                include_header=False,
+                cache_dir=cache_dir,
+            )
+
+            assert "stale render" not in result
+            assert not orphan.exists()
+            assert cache_path.read_text(encoding="utf-8") != "stale render"
+
+    def test_combine_cache_key_includes_order(self):
+        """Test templates combined in a different order are cached separately."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_dir = Path(temp_dir)
+            first = combine_templates(
+                {"Python": "*.py\n", "Rust": "target/\n"},
+                cache_dir=cache_dir,
+            )
+            second = combine_templates(
+                {"Rust": "target/\n", "Python": "*.py\n"},
+                cache_dir=cache_dir,
+            )
+            assert first.index("###> Python") < first.index("###> Rust")
+            assert second.index("###> Rust") < second.index("###> Python")
@@ -1,12 +1,12 @@
 """Tests for the fetch module."""
 
 import json
-import tempfile
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch
 
 import pytest
 import responses
+from responses import matchers
 
 from gi.fetch import GitIgnoreFetcher, get_fetcher, set_fetcher
 
@@ -26,8 +26,35 @@ class TestGitIgnoreFetcher:
             == "https://api.github.com/repos/github/gitignore/contents"
         )
 
-    @responses.activate
-    def test_get_template_success(self):
+    def test_session_pooling(self):
+        """Test the session reuses pooled keep-alive connections."""
+        adapter = self.fetcher.session.get_adapter("https://example.com")
+        assert adapter.poolmanager.connection_pool_kw["maxsize"] == 32
+        assert adapter.poolmanager.connection_pool_kw["block"] is False
+        assert self.fetcher.session.headers["Connection"] == "keep-alive"
+        assert self.fetcher.session.headers["User-Agent"].startswith("gi/")
+
+    def test_requests_use_timeout(self, tmp_path, mocked_responses):
+        """Test every request carries the fetcher's timeout."""
+        mocked_responses.add(
+            responses.GET, "https://example.com/Python.gitignore", body=""
+        )
+
+        with (
+            patch(
+                "gi.fetch.get_template_cache_path",
+                return_value=tmp_path / "Python.gitignore",
+            ),
+            patch.object(self.fetcher, "get_index", return_value={}),
+        ):
+            self.fetcher.get_template("Python", no_cache=True)
+
+        assert (
+            mocked_responses.calls[0].request.req_kwargs["timeout"]
+            == self.fetcher.timeout
+        )
+
+    def test_get_template_success(self, mocked_responses):
         """Test successful template fetching."""
         template_content = """# Byte-compiled / optimized / DLL files
 __pycache__/
@@ -245,7 +272,7 @@ __marimo__/
 
 # Streamlit
 .streamlit/secrets.toml"""
-        responses.add(
+        mocked_responses.add(
             responses.GET,
             "https://example.com/Python.gitignore",
             body=template_content,
@@ -255,10 +282,9 @@ __marimo__/
         result = self.fetcher.get_template("Python")
         assert result == template_content
 
-    @responses.activate
-    def test_get_template_not_found(self):
+    def test_get_template_not_found(self, mocked_responses):
         """Test template not found."""
-        responses.add(
+        mocked_responses.add(
             responses.GET,
             "https://example.com/Nonexistent.gitignore",
             status=404,
@@ -267,39 +293,92 @@ __marimo__/
         with pytest.raises(RuntimeError, match="Failed to fetch template"):
             self.fetcher.get_template("Nonexistent")
 
-    @responses.activate
-    def test_get_template_with_cache(self):
+    def test_get_template_with_cache(self, tmp_path, mocked_responses):
         """Test template fetching with cache."""
         template_content = "*.py\n__pycache__/\n"
-        responses.add(
+        mocked_responses.add(
             responses.GET,
             "https://example.com/Python.gitignore",
             body=template_content,
             status=200,
         )
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            cache_path = Path(temp_dir) / "Python.gitignore"
+        cache_path = tmp_path / "Python.gitignore"
 
-            with patch("gi.fetch.get_template_cache_path") as mock_cache_path:
-                mock_cache_path.return_value = cache_path
+        with patch("gi.fetch.get_template_cache_path") as mock_cache_path:
+            mock_cache_path.return_value = cache_path
 
-                # First fetch should hit the network
-                result1 = self.fetcher.get_template("Python")
-                assert result1 == template_content
+            # First fetch should hit the network
+            result1 = self.fetcher.get_template("Python")
+            assert result1 == template_content
 
-                # Second fetch should use cache (no additional network request)
-                result2 = self.fetcher.get_template("Python")
-                assert result2 == template_content
+            # Second fetch should use cache (no additional network request)
+            result2 = self.fetcher.get_template("Python")
+            assert result2 == template_content
 
-                # Should only have made one network request
-                assert len(responses.calls) == 1
+            # Should only have made one network request
+            assert len(mocked_responses.calls) == 1
 
-    @responses.activate
-    def test_get_template_no_cache(self):
+    def test_get_template_caches_global_template(self, tmp_path, mocked_responses):
+        """Test a Global/ template is cached in its own subdirectory."""
+        mocked_responses.add(
+            responses.GET,
+            "https://example.com/Global/Vim.gitignore",
+            body="*.swp\n",
+        )
+        cache_path = tmp_path / "Global" / "Vim.gitignore"
+
+        with (
+            patch("gi.fetch.get_template_cache_path", return_value=cache_path),
+            patch.object(self.fetcher, "get_index", return_value={}),
+        ):
+            assert self.fetcher.get_template("Global/Vim") == "*.swp\n"
+
+        assert cache_path.read_bytes() == b"*.swp\n"
+
+    def test_get_templates(self, tmp_path, mocked_responses):
+        """Test fetching several templates at once, each only once."""
+        python_call = mocked_responses.add(
+            responses.GET, "https://example.com/Python.gitignore", body="*.pyc\n"
+        )
+        mocked_responses.add(
+            responses.GET, "https://example.com/Missing.gitignore", status=404
+        )
+
+        with (
+            patch(
+                "gi.fetch.get_template_cache_path",
+                side_effect=lambda name: tmp_path / f"{name}.gitignore",
+            ),
+            patch.object(self.fetcher, "get_index", return_value={}),
+        ):
+            results = dict(self.fetcher.get_templates(["Python", "Missing", "Python"]))
+
+        assert set(results) == {"Python", "Missing"}
+        assert results["Python"].result() == "*.pyc\n"
+        with pytest.raises(RuntimeError, match="Failed to fetch template"):
+            results["Missing"].result()
+        assert python_call.call_count == 1
+
+    def test_get_template_memoized(self, tmp_path):
+        """Test templates loaded once are served from memory afterwards."""
+        cache_path = tmp_path / "Python.gitignore"
+        cache_path.write_text("*.py\n")
+
+        with (
+            patch("gi.fetch.get_template_cache_path", return_value=cache_path),
+            patch.object(self.fetcher, "get_index", return_value={}),
+        ):
+            assert self.fetcher.get_template("Python") == "*.py\n"
+
+            # The disk cache is no longer consulted
+            cache_path.unlink()
+            assert self.fetcher.get_template("Python") == "*.py\n"
+
+    def test_get_template_no_cache(self, mocked_responses):
         """Test template fetching with no_cache=True."""
         template_content = "*.py\n__pycache__/\n"
-        responses.add(
+        mocked_responses.add(
             responses.GET,
             "https://example.com/Python.gitignore",
             body=template_content,
@@ -316,10 +395,81 @@ __marimo__/
 
         # Should have made two network requests
         expected_calls = 2
-        assert len(responses.calls) == expected_calls
+        assert len(mocked_responses.calls) == expected_calls
 
-    @responses.activate
-    def test_get_index_success(self):
+    def test_get_template_not_modified(self, tmp_path, mocked_responses):
+        """Test a refresh of an unchanged template reuses the cached body."""
+        template_content = "*.py\n__pycache__/\n"
+        url = "https://example.com/Python.gitignore"
+        mocked_responses.add(
+            responses.GET,
+            url,
+            body=template_content,
+            status=200,
+            headers={"ETag": '"abc123"'},
+        )
+
+        cache_path = tmp_path / "Python.gitignore"
+
+        with (
+            patch("gi.fetch.get_template_cache_path", return_value=cache_path),
+            patch.object(self.fetcher, "get_index", return_value={}),
+        ):
+            result1 = self.fetcher.get_template("Python", no_cache=True)
+            assert result1 == template_content
+            etag_path = cache_path.with_suffix(".etag")
+            assert etag_path.read_text().startswith('"abc123"\n')
+
+            mocked_responses.replace(
+                responses.GET,
+                url,
+                status=304,
+                match=[
+                    matchers.header_matcher({"If-None-Match": '"abc123"'}),
+                ],
+            )
+            result2 = self.fetcher.get_template("Python", no_cache=True)
+            assert result2 == template_content
+
+    def test_get_template_no_cache_repairs_damaged_cache(
+        self,
+        tmp_path,
+        mocked_responses,
+    ):
+        """Test a damaged cached body is downloaded again instead of revalidated."""
+        template_content = "*.py\n__pycache__/\n"
+        url = "https://example.com/Python.gitignore"
+        mocked_responses.add(
+            responses.GET,
+            url,
+            body=template_content,
+            status=200,
+            headers={"ETag": '"abc123"'},
+        )
+
+        cache_path = tmp_path / "Python.gitignore"
+
+        with (
+            patch("gi.fetch.get_template_cache_path", return_value=cache_path),
+            patch.object(self.fetcher, "get_index", return_value={}),
+        ):
+            self.fetcher.get_template("Python", no_cache=True)
+            cache_path.write_text("CORRUPT")
+
+            mocked_responses.replace(
+                responses.GET,
+                url,
+                body=template_content,
+                status=200,
+                headers={"ETag": '"abc123"'},
+            )
+            result = self.fetcher.get_template("Python", no_cache=True)
+
+        assert "If-None-Match" not in mocked_responses.calls[-1].request.headers
+        assert result == template_content
+        assert cache_path.read_text() == template_content
+
+    def test_get_index_success(self, tmp_path, mocked_responses):
         """Test successful index fetching."""
         # Mock GitHub API response
         api_response = [
@@ -348,21 +498,24 @@ __marimo__/
             },
         ]
 
-        responses.add(
+        mocked_responses.add(
             responses.GET,
             "https://api.github.com/repos/github/gitignore/contents",
             json=api_response,
             status=200,
         )
 
-        responses.add(
+        mocked_responses.add(
             responses.GET,
             "https://api.github.com/repos/github/gitignore/contents/Global",
             json=global_response,
             status=200,
         )
 
-        result = self.fetcher.get_index()
+        with patch(
+            "gi.fetch.get_index_cache_path", return_value=tmp_path / "index.json"
+        ):
+            result = self.fetcher.get_index()
 
         assert "fetched_at" in result
         assert "source" in result
@@ -375,42 +528,121 @@ __marimo__/
         assert "Python.gitignore" in template_names
         assert "JetBrains.gitignore" in template_names
 
-    @responses.activate
-    def test_get_index_network_error_with_cache(self):
+        # Global/ templates are flagged in the index
+        is_global = {t["name"]: t["is_global"] for t in result["templates"]}
+        assert is_global == {"Python.gitignore": False, "JetBrains.gitignore": True}
+
+    def test_get_index_memoized(self, tmp_path, mocked_responses):
+        """Test the index is only loaded once per fetcher unless forced."""
+        index_call = mocked_responses.add(
+            responses.GET,
+            "https://api.github.com/repos/github/gitignore/contents",
+            json=[],
+            status=200,
+        )
+
+        index_path = tmp_path / "index.json"
+
+        with patch("gi.fetch.get_index_cache_path", return_value=index_path):
+            first = self.fetcher.get_index()
+            assert self.fetcher.get_index() is first
+            assert index_call.call_count == 1
+
+            # Forcing a refresh bypasses the in-memory copy
+            assert self.fetcher.get_index(force=True) is not first
+            expected_calls = 2
+            assert index_call.call_count == expected_calls
+
+    def test_get_index_concurrent_callers_share_one_fetch(
+        self, tmp_path, mocked_responses
+    ):
+        """Test concurrent index lookups only fetch the index once."""
+        index_call = mocked_responses.add(
+            responses.GET,
+            "https://api.github.com/repos/github/gitignore/contents",
+            json=[],
+            status=200,
+        )
+
+        index_path = tmp_path / "index.json"
+
+        with (
+            patch("gi.fetch.get_index_cache_path", return_value=index_path),
+            ThreadPoolExecutor(max_workers=8) as executor,
+        ):
+            results = list(
+                executor.map(lambda _: self.fetcher.get_index(), range(8)),
+            )
+
+        assert all(result is results[0] for result in results)
+        assert index_call.call_count == 1
+
+    def test_get_index_not_modified(self, tmp_path, mocked_responses):
+        """Test an unchanged upstream listing reuses the cached templates."""
+        root_url = "https://api.github.com/repos/github/gitignore/contents"
+        global_url = f"{root_url}/Global"
+        cached_data = {
+            "fetched_at": "2023-01-01T00:00:00Z",
+            "source": root_url,
+            "templates": [{"name": "Python.gitignore", "path": "Python.gitignore"}],
+            "etags": {root_url: '"root"', global_url: '"global"'},
+        }
+        mocked_responses.add(
+            responses.GET,
+            root_url,
+            status=304,
+            match=[matchers.header_matcher({"If-None-Match": '"root"'})],
+        )
+        mocked_responses.add(
+            responses.GET,
+            global_url,
+            status=304,
+            match=[matchers.header_matcher({"If-None-Match": '"global"'})],
+        )
+
+        index_path = tmp_path / "index.json"
+        index_path.write_text(json.dumps(cached_data))
+
+        with patch("gi.fetch.get_index_cache_path", return_value=index_path):
+            result = self.fetcher.get_index(force=True)
+
+        assert result["templates"] == cached_data["templates"]
+        assert result["etags"] == cached_data["etags"]
+        assert result["fetched_at"] != cached_data["fetched_at"]
+
+    def test_get_index_network_error_with_cache(self, tmp_path, mocked_responses):
         """Test index fetching with network error but cached data available."""
         # First, create some cached data
-        with tempfile.TemporaryDirectory() as temp_dir:
-            cache_dir = Path(temp_dir)
-            index_path = cache_dir / "index.json"
-
-            cached_data = {
-                "fetched_at": "2023-01-01T00:00:00Z",
-                "source": "https://api.github.com/repos/github/gitignore/contents/",
-                "templates": [
-                    {
-                        "name": "Python.gitignore",
-                        "path": "Python.gitignore",
-                        "download_url": "https://raw.githubusercontent.com/github/gitignore/HEAD/Python.gitignore",
-                        "size": 1234,
-                    },
-                ],
-            }
+        index_path = tmp_path / "index.json"
+
+        cached_data = {
+            "fetched_at": "2023-01-01T00:00:00Z",
+            "source": "https://api.github.com/repos/github/gitignore/contents/",
+            "templates": [
+                {
+                    "name": "Python.gitignore",
+                    "path": "Python.gitignore",
+                    "download_url": "https://raw.githubusercontent.com/github/gitignore/HEAD/Python.gitignore",
+                    "size": 1234,
+                },
+            ],
+        }
 
-            with index_path.open("w") as f:
-                json.dump(cached_data, f)
+        with index_path.open("w") as f:
+            json.dump(cached_data, f)
 
-            # Mock the cache directory
-            with patch("gi.fetch.get_index_cache_path", return_value=index_path):
-                # Mock network failure
-                responses.add(
-                    responses.GET,
-                    "https://api.github.com/repos/github/gitignore/contents/",
-                    status=500,
-                )
+        # Mock the cache directory
+        with patch("gi.fetch.get_index_cache_path", return_value=index_path):
+            # Mock network failure
+            mocked_responses.add(
+                responses.GET,
+                "https://api.github.com/repos/github/gitignore/contents/",
+                status=500,
+            )
 
-                # Should return cached data despite network error
-                result = self.fetcher.get_index()
-                assert result == cached_data
+            # Should return cached data despite network error
+            result = self.fetcher.get_index()
+            assert result == cached_data
 
     def test_list_templates(self):
         """Test listing templates."""
@@ -427,18 +659,39 @@ __marimo__/
             templates = self.fetcher.list_templates()
             assert templates == ["Python", "Rust", "Global/JetBrains"]
 
+    def test_global_template_names(self):
+        """Test listing the names of Global/ templates."""
+        mock_index = {
+            "templates": [
+                {"name": "Python.gitignore", "is_global": False},
+                {"name": "JetBrains.gitignore", "is_global": True},
+                # Entry from an index cached before the flag existed
+                {"name": "Vim.gitignore", "path": "Global/Vim.gitignore"},
+            ],
+        }
+
+        with patch.object(self.fetcher, "get_index", return_value=mock_index):
+            names = self.fetcher.global_template_names()
+            assert names == {"JetBrains", "Vim"}
+
     def test_search_templates(self):
         """Test searching templates."""
-        # Mock the list_templates method
-        with patch.object(
-            self.fetcher,
-            "list_templates",
-            return_value=["Python", "Rust", "Global/JetBrains"],
-        ):
+        mock_index = {
+            "templates": [
+                {"name": "Python.gitignore"},
+                {"name": "Rust.gitignore"},
+                {"name": "Global/JetBrains.gitignore"},
+            ],
+        }
+
+        with patch.object(self.fetcher, "get_index", return_value=mock_index):
             # Search for "python" (case insensitive)
             matches = self.fetcher.search_templates("python")
             assert matches == ["Python"]
 
+            matches = self.fetcher.search_templates("PYTHON")
+            assert matches == ["Python"]
+
             # Search for "global" (case insensitive)
             matches = self.fetcher.search_templates("global")
             assert matches == ["Global/JetBrains"]
@@ -447,6 +700,21 @@ __marimo__/
             matches = self.fetcher.search_templates("jetbrains")
             assert matches == ["Global/JetBrains"]
 
+    def test_resolve_template_path(self):
+        """Test resolving names and paths through the index."""
+        mock_index = {
+            "templates": [
+                {"name": "Python.gitignore", "path": "Python.gitignore"},
+                {"name": "Vim.gitignore", "path": "Global/Vim.gitignore"},
+            ],
+        }
+
+        with patch.object(self.fetcher, "get_index", return_value=mock_index):
+            assert self.fetcher.resolve_template_path("Python") == "Python"
+            assert self.fetcher.resolve_template_path("Vim") == "Global/Vim"
+            assert self.fetcher.resolve_template_path("Global/Vim") == "Global/Vim"
+            assert self.fetcher.resolve_template_path("Unknown") == "Unknown"
+
     def test_get_template_info(self):
         """Test getting template info."""
         # Mock the get_index method
@@ -480,6 +748,7 @@ class TestGlobalFetcher:
         """Test getting the global fetcher."""
         fetcher = get_fetcher()
         assert isinstance(fetcher, GitIgnoreFetcher)
+        assert get_fetcher() is fetcher
 
     def test_set_fetcher(self):
         """Test setting the global fetcher."""
@@ -491,3 +760,16 @@ class TestGlobalFetcher:
             assert get_fetcher() is new_fetcher
         finally:
             set_fetcher(original_fetcher)
+
+    def test_set_fetcher_closes_previous(self):
+        """Test replacing the global fetcher closes the old one."""
+        original_fetcher = get_fetcher()
+        new_fetcher = GitIgnoreFetcher("https://example.com")
+
+        with patch.object(original_fetcher, "close") as mock_close:
+            set_fetcher(new_fetcher)
+            mock_close.assert_called_once()
+
+        with patch.object(new_fetcher, "close") as mock_close:
+            set_fetcher(original_fetcher)
+            mock_close.assert_called_once()
@@ -30,6 +30,12 @@ class TestNormalizeTemplateName:
         assert normalize_template_name("macos") == "macOS"
         assert normalize_template_name("jetbrains") == "Global/JetBrains"
 
+    def test_perforce_aliases(self):
+        """Test only the listed p4 names resolve to Perforce."""
+        assert normalize_template_name("p4") == "Perforce"
+        assert normalize_template_name("P4Web") == "Perforce"
+        assert normalize_template_name("p4merge") == "P4Merge"
+
     def test_underscore_dash_normalization(self):
         """Test underscore and dash normalization."""
         assert normalize_template_name("visual_studio_code") == "Visual Studio Code"
@@ -1,15 +1,20 @@
 """Tests for the util module."""
 
+import stat
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from unittest.mock import patch
 
 from gi.util import (
+    atomic_write_bytes,
+    dump_json,
     ensure_trailing_newline,
     get_cache_dir,
     get_index_cache_path,
     get_template_cache_path,
     is_stale_cache,
+    load_json,
     normalize_line_endings,
     read_existing_gitignore,
     safe_write_file,
@@ -19,6 +24,14 @@ from gi.util import (
 class TestGetCacheDir:
     """Test cache directory functionality."""
 
+    def setup_method(self):
+        """Clear the memoized cache directory."""
+        get_cache_dir.cache_clear()
+
+    def teardown_method(self):
+        """Drop the cache directory computed under mocks."""
+        get_cache_dir.cache_clear()
+
     def test_get_cache_dir_windows(self):
         """Test cache directory on Windows."""
         with (
@@ -47,13 +60,26 @@ class TestGetCacheDir:
             assert cache_dir == Path("/home/user/.cache/gi")
             mock_cache_dir.assert_called_once_with("gi")
 
+    def test_get_cache_dir_memoized(self):
+        """Test the cache directory is only resolved and created once."""
+        with (
+            patch(
+                "platformdirs.user_cache_dir",
+                return_value="/home/user/.cache/gi",
+            ) as mock_cache_dir,
+            patch("pathlib.Path.mkdir") as mock_mkdir,
+        ):
+            assert get_cache_dir() is get_cache_dir()
+            mock_cache_dir.assert_called_once()
+            mock_mkdir.assert_called_once()
+
     def test_get_cache_dir_creates_directory(self):
         """Test that cache directory is created if it doesn't exist."""
         with tempfile.TemporaryDirectory() as temp_dir:
             cache_path = Path(temp_dir) / "test_cache"
 
             with patch(
-                "gi.util.platformdirs.user_cache_dir",
+                "platformdirs.user_cache_dir",
                 return_value=str(cache_path),
             ):
                 cache_dir = get_cache_dir()
@@ -124,6 +150,10 @@ class TestEnsureTrailingNewline:
         result = ensure_trailing_newline("")
         assert result == ""
 
+    def test_ensure_trailing_newline_only_newline(self):
+        """Test text made only of a newline."""
+        assert ensure_trailing_newline("\n") == ""
+
     def test_ensure_trailing_newline_multiple_newlines(self):
         """Test text with multiple trailing newlines."""
         text = "line1\nline2\n\n\n"
@@ -210,6 +240,100 @@ class TestSafeWriteFile:
             assert file_path.exists()
             assert file_path.read_text() == content
 
+    def test_safe_write_file_leaves_no_temp_files(self):
+        """Test the atomic write cleans up after itself."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = Path(temp_dir) / ".gitignore"
+            file_path.write_text("original content")
+
+            result = safe_write_file(file_path, "new content", force=True)
+            assert result is True
+            assert [p.name for p in Path(temp_dir).iterdir()] == [".gitignore"]
+
+    def test_safe_write_file_preserves_mode(self):
+        """Test overwriting keeps the existing file's permissions."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = Path(temp_dir) / ".gitignore"
+            file_path.write_text("original content")
+            file_path.chmod(0o640)
+
+            safe_write_file(file_path, "new content", force=True)
+            assert stat.S_IMODE(file_path.stat().st_mode) == 0o640
+
+    def test_safe_write_file_new_file_honours_umask(self):
+        """Test a new file gets the permissions a normal create would give."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = Path(temp_dir) / ".gitignore"
+            reference = Path(temp_dir) / "reference"
+            reference.touch()
+
+            safe_write_file(file_path, "*.pyc\n")
+            assert stat.S_IMODE(file_path.stat().st_mode) == stat.S_IMODE(
+                reference.stat().st_mode,
+            )
+
+    def test_atomic_write_bytes_concurrent_writers(self):
+        """Test threads writing the same path never break each other's writes."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = Path(temp_dir) / "Emacs.gitignore"
+            payloads = [f"{i}\n".encode() * 1000 for i in range(4)]
+
+            def write(index: int) -> None:
+                atomic_write_bytes(file_path, payloads[index % len(payloads)])
+
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                list(executor.map(write, range(400)))
+
+            assert file_path.read_bytes() in payloads
+            assert [p.name for p in Path(temp_dir).iterdir()] == ["Emacs.gitignore"]
+
+    def test_safe_write_file_writes_through_symlink(self):
+        """Test overwriting a symlinked file updates the link's target."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            target = Path(temp_dir) / "dot" / "gitignore"
+            target.parent.mkdir()
+            target.write_text("original content")
+            link = Path(temp_dir) / ".gitignore"
+            link.symlink_to(target)
+
+            safe_write_file(link, "new content", force=True)
+            assert link.is_symlink()
+            assert target.read_text() == "new content"
+
+    def test_safe_write_file_syncs_to_disk(self):
+        """Test the content is flushed to disk before it replaces the file."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = Path(temp_dir) / ".gitignore"
+
+            with patch("os.fsync") as mock_fsync:
+                safe_write_file(file_path, "*.pyc\n")
+                mock_fsync.assert_called_once()
+            assert file_path.read_text() == "*.pyc\n"
+
+
+class TestJsonCache:
+    """Test JSON cache file helpers."""
+
+    def test_dump_and_load_json_round_trip(self):
+        """Test data written by dump_json is read back by load_json."""
+        data = {"source": "github/gitignore", "templates": [{"name": "Python"}]}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_path = Path(temp_dir) / "index.json"
+            dump_json(cache_path, data)
+
+            assert cache_path.read_bytes().endswith(b"\n")
+            assert load_json(cache_path) == data
+
+    def test_dump_and_load_json_without_orjson(self):
+        """Test the stdlib fallback round-trips the same data."""
+        data = {"source": "github/gitignore", "templates": [{"name": "Python"}]}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_path = Path(temp_dir) / "index.json"
+            with patch("gi.util.orjson", None):
+                dump_json(cache_path, data)
+                assert cache_path.read_bytes().endswith(b"\n")
+                assert load_json(cache_path) == data
+
 
 class TestReadExistingGitignore:
     """Test reading existing .gitignore files."""